@@ -3,7 +3,38 @@
 from __future__ import annotations
 
 import os
-import re
+from urllib.parse import urlsplit
+
+# Platform hints accepted before a ':' in repo IDs (matched case-insensitively)
+_PLATFORM_PREFIXES = {
+    "hf": "hf",
+    "huggingface": "hf",
+    "ms": "ms",
+    "modelscope": "ms",
+}
+
+# Accepted --to values per platform
+_MS_NAMES = frozenset(("ms", "modelscope"))
+_HF_NAMES = frozenset(("hf", "huggingface"))
+
+# Path prefix of each repo type in web URLs; unknown ModelScope types are models
+_HF_TYPE_PREFIX = {"model": "", "dataset": "datasets/", "space": "spaces/"}
+_MS_TYPE_PREFIX = {"model": "models/", "dataset": "datasets/"}
+
+# Besides letters and digits (str.isalnum, the same set as regex \w), repo
+# ID halves may contain these
+_REPO_ID_PUNCT = frozenset("_.~-")
+
+
+def normalize_domain(domain: str) -> str:
+    """Reduce a domain setting to a bare host (e.g. 'https://modelscope.ai/' -> 'modelscope.ai').
+
+    Any scheme and path are dropped; an explicit port is kept. Empty input
+    falls back to modelscope.cn.
+    """
+    domain = domain.strip()
+    parts = urlsplit(domain if "://" in domain else "//" + domain)
+    return parts.netloc or "modelscope.cn"
 
 
 def get_ms_domain() -> str:
@@ -12,12 +43,7 @@ def get_ms_domain() -> str:
     Returns bare domain (e.g. 'modelscope.ai') — no protocol prefix.
     The ModelScope SDK expects this format for MODELSCOPE_DOMAIN env var.
     """
-    domain = os.environ.get("MODELSCOPE_DOMAIN", "modelscope.cn").strip().rstrip("/")
-    # Strip protocol if user included it
-    for prefix in ("https://", "http://"):
-        if domain.startswith(prefix):
-            domain = domain[len(prefix):]
-    return domain
+    return normalize_domain(os.environ.get("MODELSCOPE_DOMAIN", ""))
 
 
 def get_env_token(name: str) -> str:
@@ -54,22 +80,18 @@ def parse_repo_id(user_input: str) -> tuple[str, str | None]:
     """
     user_input = user_input.strip()
 
-    platform_prefixes = {
-        "hf:": "hf",
-        "huggingface:": "hf",
-        "ms:": "ms",
-        "modelscope:": "ms",
-    }
-
     platform = None
-    for prefix, plat in platform_prefixes.items():
-        if user_input.lower().startswith(prefix):
-            user_input = user_input[len(prefix):]
-            platform = plat
-            break
+    head, sep, rest = user_input.partition(":")
+    if sep and head.lower() in _PLATFORM_PREFIXES:
+        platform = _PLATFORM_PREFIXES[head.lower()]
+        user_input = rest
 
     # Validate repo_id format: namespace/name
-    if not re.match(r"^[\w.~-]+/[\w.~-]+$", user_input):
+    namespace, _, name = user_input.partition("/")
+    if not (
+        namespace and name and "/" not in name
+        and all(c.isalnum() or c in _REPO_ID_PUNCT for c in namespace + name)
+    ):
         raise ValueError(
             f"Invalid repo ID: '{user_input}'. Expected format: 'username/repo-name'"
         )
@@ -85,11 +107,9 @@ def detect_direction(source_platform: str | None, to_flag: str | None) -> tuple[
     """
     if to_flag:
         to_flag = to_flag.lower().strip()
-        valid_ms = ("ms", "modelscope")
-        valid_hf = ("hf", "huggingface")
-        if to_flag in valid_ms:
+        if to_flag in _MS_NAMES:
             dest = "ms"
-        elif to_flag in valid_hf:
+        elif to_flag in _HF_NAMES:
             dest = "hf"
         else:
             raise ValueError(f"Invalid --to value: '{to_flag}'. Must be one of: hf, huggingface, ms, modelscope")
@@ -109,19 +129,18 @@ def detect_direction(source_platform: str | None, to_flag: str | None) -> tuple[
     raise ValueError("Cannot determine migration direction. Use --to hf|ms or prefix repo with hf:/ms:")
 
 
-def build_url(repo_id: str, platform: str, repo_type: str = "model") -> str:
+def build_url(repo_id: str, platform: str, repo_type: str = "model", ms_domain: str = "") -> str:
     """Build the web URL for a repo on the given platform.
 
     Args:
         repo_id: "namespace/name"
         platform: "hf" or "ms"
         repo_type: "model", "dataset", or "space"
+        ms_domain: Normalized ModelScope domain; read from the environment if omitted.
     """
     if platform == "hf":
-        type_prefix = {"model": "", "dataset": "datasets/", "space": "spaces/"}
-        return f"https://huggingface.co/{type_prefix.get(repo_type, '')}{repo_id}"
+        return f"https://huggingface.co/{_HF_TYPE_PREFIX.get(repo_type, '')}{repo_id}"
 
     # ModelScope
-    ms_domain = get_ms_domain()
-    type_prefix = {"model": "models/", "dataset": "datasets/"}
-    return f"https://{ms_domain}/{type_prefix.get(repo_type, 'models/')}{repo_id}"
+    ms_domain = ms_domain or get_ms_domain()
+    return f"https://{ms_domain}/{_MS_TYPE_PREFIX.get(repo_type, 'models/')}{repo_id}"
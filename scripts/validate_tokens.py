@@ -8,7 +8,6 @@ from __future__ import annotations
 
 import os
 import sys
-from pathlib import Path
 
 
 def load_dotenv() -> None:
@@ -16,11 +15,11 @@ def load_dotenv() -> None:
     # Try plugin root first, then script's parent directory
     plugin_root = os.environ.get("CLAUDE_PLUGIN_ROOT", "")
     candidates = [
-        Path(plugin_root) / ".env" if plugin_root else None,
-        Path(__file__).resolve().parent.parent / ".env",
+        os.path.join(plugin_root, ".env") if plugin_root else None,
+        os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), ".env"),
     ]
     for env_path in candidates:
-        if env_path and env_path.is_file():
+        if env_path and os.path.isfile(env_path):
             try:
                 with open(env_path, encoding="utf-8") as f:
                     for line in f:
@@ -32,12 +31,14 @@ def load_dotenv() -> None:
                         # Handle 'export KEY=value' syntax
                         if key.startswith("export "):
                             key = key[7:].strip()
+                        # Existing vars win, so skip their values unparsed
+                        if not key or key in os.environ:
+                            continue
                         value = value.strip()
                         # Strip surrounding quotes
                         if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
                             value = value[1:-1]
-                        if key and key not in os.environ:
-                            os.environ[key] = value
+                        os.environ[key] = value
             except (OSError, UnicodeDecodeError) as e:
                 print(f"  WARNING: Could not read {env_path}: {e}")
             break
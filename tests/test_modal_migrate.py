@@ -0,0 +1,260 @@
+"""Tests for pure helpers in scripts/modal_migrate.py (needs modal installed to import)."""
+
+import fnmatch
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("modal")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import modal_migrate  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    ("original", "expected"),
+    [
+        (b"---\nlicense: Apache-2.0\n---\nbody\n", b"---\nlicense: apache-2.0\n---\nbody\n"),
+        (b"---\nlicense: proprietary\n---\n", b"---\nlicense: other\n---\n"),
+        # CRLF fences and lines are recognized, and kept as they were
+        (b"---\r\nlicense: MIT\r\n---\r\nbody\r\n", b"---\r\nlicense: mit\r\n---\r\nbody\r\n"),
+        (b"---\r\nlicense: proprietary\r\ntags: [a]\r\n---\r\n", b"---\r\nlicense: other\r\ntags: [a]\r\n---\r\n"),
+        # Already valid, or no front matter: untouched
+        (b"---\r\nlicense: mit\r\n---\r\n", b"---\r\nlicense: mit\r\n---\r\n"),
+        (b"# Title\nlicense: MIT\n", b"# Title\nlicense: MIT\n"),
+    ],
+)
+def test_sanitize_readme_for_hf(tmp_path, original, expected):
+    readme = tmp_path / "README.md"
+    readme.write_bytes(original)
+    modal_migrate._sanitize_readme_for_hf(str(readme))
+    assert readme.read_bytes() == expected
+
+
+def _file(path, size, is_lfs=True, sha256=None):
+    entry = {"path": path, "size": size, "is_lfs": is_lfs}
+    if sha256:
+        entry["sha256"] = sha256
+    return entry
+
+
+_MANIFESTS = [
+    # Small files only
+    [_file("README.md", 10, False), _file("config.json", 20, False)],
+    # Mixed, with a file larger than the chunk size
+    [
+        _file("README.md", 10, False),
+        _file("a.bin", 60),
+        _file("b.bin", 250),
+        _file("c.bin", 40),
+        _file("d.bin", 90),
+    ],
+    # Same-sha copies alongside unique files
+    [
+        _file(".gitattributes", 5, False),
+        _file("v1/model.bin", 70, sha256="aa"),
+        _file("v2/model.bin", 70, sha256="aa"),
+        _file("v3/model.bin", 70, sha256="aa"),
+        _file("x.bin", 30, sha256="bb"),
+        _file("y.bin", 30, sha256="cc"),
+        _file("z.bin", 95),
+    ],
+    # LFS only, nothing for chunk 0
+    [_file("a.bin", 50), _file("b.bin", 50), _file("c.bin", 50)],
+]
+
+
+@pytest.mark.parametrize("manifest", _MANIFESTS)
+@pytest.mark.parametrize("packer", [modal_migrate._build_chunks, modal_migrate._balance_chunks])
+def test_chunks_cover_manifest_once(packer, manifest):
+    chunks = packer(manifest, 100)
+    paths = [f["path"] for c in chunks for f in c]
+    assert sorted(paths) == sorted(f["path"] for f in manifest)
+    assert all(chunks)
+
+
+@pytest.mark.parametrize("manifest", _MANIFESTS)
+@pytest.mark.parametrize("packer", [modal_migrate._build_chunks, modal_migrate._balance_chunks])
+def test_chunk0_holds_all_non_lfs(packer, manifest):
+    chunks = packer(manifest, 100)
+    non_lfs = [f["path"] for f in manifest if not f["is_lfs"]]
+    if non_lfs:
+        assert [f["path"] for f in chunks[0] if not f["is_lfs"]] == non_lfs
+    assert not any(not f["is_lfs"] for c in chunks[1:] for f in c)
+
+
+@pytest.mark.parametrize("manifest", _MANIFESTS)
+@pytest.mark.parametrize("packer", [modal_migrate._build_chunks, modal_migrate._balance_chunks])
+def test_same_sha_copies_share_a_chunk(packer, manifest):
+    chunks = packer(manifest, 100)
+    owner = {}
+    for i, c in enumerate(chunks):
+        for f in c:
+            if f.get("sha256"):
+                assert owner.setdefault(f["sha256"], i) == i
+
+
+def test_build_chunks_oversized_file_gets_own_chunk():
+    manifest = [_file("README.md", 10, False), _file("big.bin", 250), _file("a.bin", 30)]
+    chunks = modal_migrate._build_chunks(manifest, 100)
+    assert [[f["path"] for f in c] for c in chunks] == [["README.md", "a.bin"], ["big.bin"]]
+
+
+def _chunk_cost(chunk):
+    return sum({f.get("sha256") or f["path"]: f["size"] for f in chunk}.values())
+
+
+def test_packers_weigh_same_sha_copies_once():
+    copies = [_file(f"v{i}/model.bin", 40, sha256="aa") for i in range(4)]
+    manifest = copies + [_file(f"{n}.bin", 40, sha256=n) for n in "bcd"]
+
+    balanced = modal_migrate._balance_chunks(manifest, 100)
+    assert [_chunk_cost(c) for c in balanced] == [80, 80]
+
+    packed = modal_migrate._build_chunks(manifest, 100)
+    assert [_chunk_cost(c) for c in packed] == [80, 80]
+
+
+def test_filter_manifest_reports_size_only_when_known(capsys):
+    sized = [{"path": "a.bin", "size": 2048}, {"path": "README.md", "size": 10}]
+    modal_migrate._filter_manifest(sized, ignore_patterns=["*.bin"])
+    assert "Excluding 1 files (2.0 KB) by file filters" in capsys.readouterr().out
+
+    names_only = [{"path": "a.bin"}, {"path": "README.md"}]
+    kept = modal_migrate._filter_manifest(names_only, ignore_patterns=["*.bin"])
+    assert kept == [{"path": "README.md"}]
+    assert "Excluding 1 files by file filters" in capsys.readouterr().out
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code, message="error"):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def test_retry_rate_limited_retries_only_on_status_429(monkeypatch):
+    monkeypatch.setattr(modal_migrate.time, "sleep", lambda _: None)
+    calls = []
+
+    def flaky():
+        calls.append(None)
+        if len(calls) == 1:
+            raise _StatusError(429)
+        return "ok"
+
+    assert modal_migrate._retry_rate_limited(flaky) == "ok"
+    assert len(calls) == 2
+
+    def message_only():
+        calls.append(None)
+        raise _StatusError(None, "upstream said 429")
+
+    calls.clear()
+    with pytest.raises(_StatusError):
+        modal_migrate._retry_rate_limited(message_only)
+    assert len(calls) == 1
+
+
+def test_detect_repo_type_retries_rate_limited_probes(monkeypatch):
+    pytest.importorskip("huggingface_hub")
+    from huggingface_hub.utils import RepositoryNotFoundError
+
+    monkeypatch.setattr(modal_migrate.time, "sleep", lambda _: None)
+    limited = {"model": 1}
+
+    class FakeApi:
+        def _probe(self, type_name):
+            if limited.get(type_name):
+                limited[type_name] -= 1
+                raise _StatusError(429)
+            if type_name != "model":
+                raise RepositoryNotFoundError("missing")
+
+        def model_info(self, repo_id):
+            self._probe("model")
+
+        def dataset_info(self, repo_id):
+            self._probe("dataset")
+
+        def space_info(self, repo_id):
+            self._probe("space")
+
+    monkeypatch.setattr(modal_migrate, "_hf_api", lambda token: FakeApi())
+    assert modal_migrate.detect_repo_type.local("a/b", "hf", "tok") == "model"
+
+
+def test_discard_git_dir_moves_git_out_of_the_tree(tmp_path):
+    clone_dir = tmp_path / "repo"
+    (clone_dir / ".git" / "objects").mkdir(parents=True)
+    (clone_dir / "model.bin").write_bytes(b"x")
+
+    modal_migrate._discard_git_dir(str(clone_dir))
+    assert sorted(p.name for p in clone_dir.iterdir()) == ["model.bin"]
+    # The relocated .git sits in a single trash level beside the clone
+    for trash in tmp_path.glob(".git.trash_*"):
+        assert [p.name for p in trash.iterdir()] in ([], ["tree"])
+
+
+def test_scratch_root_reserves_tmpfs_for_concurrent_callers(tmp_path, monkeypatch):
+    monkeypatch.setattr(modal_migrate, "SHM_DIR", str(tmp_path))
+    monkeypatch.setattr(modal_migrate, "_memory_headroom", lambda: 1000)
+    usage = modal_migrate.shutil.disk_usage(tmp_path)._replace(free=1000)
+    monkeypatch.setattr(modal_migrate.shutil, "disk_usage", lambda _: usage)
+
+    first = modal_migrate._scratch_root(300)
+    assert first == str(tmp_path)
+    # 300 bytes are already promised; another 300 (2x margin) no longer fits
+    assert modal_migrate._scratch_root(300) is None
+    modal_migrate._release_scratch(first, 300)
+    second = modal_migrate._scratch_root(300)
+    assert second == str(tmp_path)
+    modal_migrate._release_scratch(second, 300)
+
+
+@pytest.mark.parametrize(
+    ("size", "expected"),
+    [
+        (0, "0.0 B"),
+        (1, "1.0 B"),
+        (1023, "1023.0 B"),
+        (1024, "1.0 KB"),
+        (1536, "1.5 KB"),
+        (1024 ** 2 - 1, "1024.0 KB"),
+        (1024 ** 3, "1.0 GB"),
+        (1024 ** 4, "1.0 TB"),
+        (1024 ** 5, "1.0 PB"),
+        (2048 * 1024 ** 5, "2048.0 PB"),
+    ],
+)
+def test_format_size(size, expected):
+    assert modal_migrate._format_size(size) == expected
+
+
+@pytest.mark.parametrize(("size", "error"), [(1.5, TypeError), ("1024", TypeError), (-1, ValueError)])
+def test_format_size_rejects_bad_input(size, error):
+    with pytest.raises(error):
+        modal_migrate._format_size(size)
+
+
+@pytest.mark.parametrize(
+    ("path", "pattern"),
+    [
+        ("model.safetensors", "model.safetensors"),
+        ("dir/my file.bin", "dir/my file.bin"),
+        ("a,b.bin", "a?b.bin"),
+        ("w*[1]?.bin", "w??1??.bin"),
+        ("back\\slash.bin", "back?slash.bin"),
+        (" padded.bin  ", "?padded.bin??"),
+        ("!neg.bin", "?neg.bin"),
+        ("#hash.bin", "?hash.bin"),
+    ],
+)
+def test_lfs_fetchinclude_escapes_special_characters(path, pattern):
+    assert modal_migrate._lfs_fetchinclude([path]) == pattern
+    assert fnmatch.fnmatchcase(path, pattern)
+
+
+def test_lfs_fetchinclude_joins_with_commas():
+    assert modal_migrate._lfs_fetchinclude(["a.bin", "b,c.bin"]) == "a.bin,b?c.bin"
+    assert modal_migrate._lfs_fetchinclude([]) == ""
@@ -0,0 +1,68 @@
+"""Tests for scripts/utils.py."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import utils  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    ("user_input", "expected"),
+    [
+        ("a/b", ("a/b", None)),
+        ("hf:a/b", ("a/b", "hf")),
+        ("HF:a/b", ("a/b", "hf")),
+        ("huggingface:org/model", ("org/model", "hf")),
+        ("ms:a/b", ("a/b", "ms")),
+        ("ModelScope:damo/text-to-video", ("damo/text-to-video", "ms")),
+        ("  hf:a/b  ", ("a/b", "hf")),
+        # Leading punctuation is allowed, as with the original [\w.~-]+ pattern
+        ("-a/b", ("-a/b", None)),
+        ("user_1/repo.v2~x", ("user_1/repo.v2~x", None)),
+        # Unicode letters and digits count as word characters
+        ("ü/模型٣", ("ü/模型٣", None)),
+    ],
+)
+def test_parse_repo_id(user_input, expected):
+    assert utils.parse_repo_id(user_input) == expected
+
+
+@pytest.mark.parametrize(
+    "user_input",
+    ["a/b/c", "a", "a/", "/b", "", "hf:", "hf:ms:a/b", "x:a/b", "a /b", "a/b:c", "hf: a/b", "a/b\n\x00"],
+)
+def test_parse_repo_id_rejects(user_input):
+    with pytest.raises(ValueError, match="Invalid repo ID"):
+        utils.parse_repo_id(user_input)
+
+
+@pytest.mark.parametrize(
+    ("domain", "expected"),
+    [
+        ("modelscope.cn", "modelscope.cn"),
+        ("https://modelscope.ai/", "modelscope.ai"),
+        ("http://modelscope.cn", "modelscope.cn"),
+        ("  modelscope.ai/  ", "modelscope.ai"),
+        ("//modelscope.cn/path", "modelscope.cn"),
+        ("https://modelscope.cn/models/a/b", "modelscope.cn"),
+        ("localhost:8080", "localhost:8080"),
+        ("", "modelscope.cn"),
+    ],
+)
+def test_normalize_domain(domain, expected):
+    assert utils.normalize_domain(domain) == expected
+
+
+def test_get_ms_domain_and_build_url(monkeypatch):
+    monkeypatch.setenv("MODELSCOPE_DOMAIN", "https://modelscope.ai/")
+    assert utils.get_ms_domain() == "modelscope.ai"
+    assert utils.build_url("a/b", "ms", "dataset") == "https://modelscope.ai/datasets/a/b"
+    assert utils.build_url("a/b", "ms", "space", "modelscope.cn") == "https://modelscope.cn/models/a/b"
+    assert utils.build_url("a/b", "hf", "space") == "https://huggingface.co/spaces/a/b"
+
+    monkeypatch.delenv("MODELSCOPE_DOMAIN")
+    assert utils.get_ms_domain() == "modelscope.cn"